@@ -6,10 +6,13 @@ Prevents memory issues by processing only a few pages at a time.
 
 import sys
 import logging
-import time
 from pathlib import Path
 import gc
+import heapq
+import queue
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -59,11 +62,7 @@ def convert_pdf_batch(pdf_path, output_dir, start_page, end_page):
             img_path = output_dir / filename
             image.save(img_path, 'PNG')
             image_paths.append(img_path)
-        
-        # Clean up
-        del images
-        gc.collect()
-        
+
         return image_paths
         
     except Exception as e:
@@ -71,35 +70,70 @@ def convert_pdf_batch(pdf_path, output_dir, start_page, end_page):
         return []
 
 
-def process_image_to_text(image_path, preprocessor, ocr_engine, page_num):
-    """Process one image and return text."""
-    try:
-        # Load
-        image = cv2.imread(str(image_path))
-        if image is None:
-            return ""
-        
-        # Resize if needed
-        h, w = image.shape[:2]
-        if h > 3000 or w > 3000:
-            scale = 3000 / max(h, w)
-            image = cv2.resize(image, (int(w*scale), int(h*scale)))
-        
-        # Preprocess
-        preprocessed = preprocessor.preprocess(image)
-        del image
-        
-        # OCR
-        text = ocr_engine.extract_text(preprocessed)
-        del preprocessed
-        gc.collect()
-        
-        return text
-        
-    except Exception as e:
-        logger.error(f"  Error on page {page_num}: {e}")
-        gc.collect()
-        return ""
+def preprocess_pages(image_paths, start_page, preprocessor, out_queue):
+    """Load, resize and preprocess a batch of page images (stage thread).
+
+    Feeds (page_num, image_path, preprocessed) tuples into a bounded queue
+    so OCR consumes one page while the next is being preprocessed; ends
+    with a None sentinel. Failed pages are forwarded with preprocessed=None
+    to keep the page accounting sequential.
+    """
+    for offset, img_path in enumerate(image_paths):
+        page_num = start_page + offset
+        preprocessed = None
+        try:
+            # Single-channel decode: preprocessing grayscales first anyway,
+            # and the 1-channel array cuts decode time and memory bandwidth
+            image = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+            if image is not None:
+                # Resize if needed
+                h, w = image.shape[:2]
+                if h > 3000 or w > 3000:
+                    scale = 3000 / max(h, w)
+                    # INTER_AREA's box filter is only worth it for strong
+                    # downscales; for mild ones INTER_LINEAR is ~2x faster
+                    # and looks the same
+                    interp = cv2.INTER_AREA if scale < 0.5 else cv2.INTER_LINEAR
+                    image = cv2.resize(image, (int(w*scale), int(h*scale)),
+                                       interpolation=interp)
+                # Copy: preprocess() output may alias the preprocessor's
+                # reusable scratch buffer, which this thread overwrites with
+                # the next page while OCR still reads the previous one
+                preprocessed = preprocessor.preprocess(image).copy()
+        except Exception as e:
+            logger.error(f"  Error preprocessing page {page_num}: {e}")
+        out_queue.put((page_num, img_path, preprocessed))
+
+    out_queue.put(None)
+
+
+def write_pages_in_order(output_file, page_queue, total_pages):
+    """Consume (page_num, text) tuples and write them in page order.
+
+    Results may arrive out of order; a small heap keyed on page number
+    reorders them so the raw file stays sequential.
+    """
+    pending = []
+    next_page = 1
+    written = 0
+
+    while written < total_pages:
+        item = page_queue.get()
+        if item is None:
+            break
+
+        heapq.heappush(pending, item)
+
+        while pending and pending[0][0] == next_page:
+            page_num, text = heapq.heappop(pending)
+            output_file.write(f"\n{'='*50}\n")
+            output_file.write(f"PAGE {page_num}\n")
+            output_file.write(f"{'='*50}\n")
+            output_file.write(text)
+            output_file.write("\n")
+            output_file.flush()
+            next_page += 1
+            written += 1
 
 
 def get_pdf_page_count(pdf_path):
@@ -141,65 +175,120 @@ def process_pdf_in_batches(pdf_path, output_raw, output_clean):
         preprocessor = ImagePreprocessor()
         ocr_engine = TesseractEngine()
         
-        # Open raw output file
-        with open(output_raw, 'w', encoding='utf-8') as f:
-            
-            # Process in batches
+        # Open raw output file; a writer thread consumes OCR results from a
+        # queue while the next batch is already being rasterized.
+        with open(output_raw, 'w', encoding='utf-8') as f, \
+                ThreadPoolExecutor(max_workers=1) as converter:
+
+            page_queue = queue.Queue()
+            writer = threading.Thread(
+                target=write_pages_in_order,
+                args=(f, page_queue, total_pages)
+            )
+            writer.start()
+
+            # Kick off conversion of the first batch
+            next_batch = converter.submit(
+                convert_pdf_batch, pdf_path, image_dir,
+                1, min(BATCH_SIZE, total_pages)
+            )
+
             page_num = 1
             while page_num <= total_pages:
                 batch_end = min(page_num + BATCH_SIZE - 1, total_pages)
-                
+
                 logger.info(f"\nBatch: pages {page_num}-{batch_end} of {total_pages}")
-                
-                # Convert this batch
-                image_paths = convert_pdf_batch(pdf_path, image_dir, page_num, batch_end)
-                
+
+                # Wait for this batch, then start converting the next one
+                # while OCR runs on the current pages
+                image_paths = next_batch.result()
+                if batch_end < total_pages:
+                    next_start = batch_end + 1
+                    next_end = min(next_start + BATCH_SIZE - 1, total_pages)
+                    next_batch = converter.submit(
+                        convert_pdf_batch, pdf_path, image_dir,
+                        next_start, next_end
+                    )
+
                 if not image_paths:
                     logger.warning(f"No images generated for batch {page_num}-{batch_end}")
+                    # Keep the writer's page accounting sequential
+                    for missing_page in range(page_num, batch_end + 1):
+                        page_queue.put((missing_page, ""))
                     page_num = batch_end + 1
                     continue
-                
-                # Process each page in batch
-                for img_path in image_paths:
-                    current_page = page_num
-                    
+
+                # Pipeline the batch: poppler renders the next batch (via
+                # the converter future), a stage thread preprocesses with
+                # OpenCV, and this thread runs Tesseract. All three release
+                # the GIL, and the small bounded queue gives backpressure so
+                # no stage races ahead of the others.
+                prep_queue = queue.Queue(maxsize=4)
+                prep_thread = threading.Thread(
+                    target=preprocess_pages,
+                    args=(image_paths, page_num, preprocessor, prep_queue)
+                )
+                prep_thread.start()
+
+                while True:
+                    item = prep_queue.get()
+                    if item is None:
+                        break
+                    current_page, img_path, preprocessed = item
+
                     logger.info(f"  Page {current_page}/{total_pages}")
-                    
-                    # Write header
-                    f.write(f"\n{'='*50}\n")
-                    f.write(f"PAGE {current_page}\n")
-                    f.write(f"{'='*50}\n")
-                    
-                    # OCR
-                    text = process_image_to_text(img_path, preprocessor, ocr_engine, current_page)
-                    f.write(text)
-                    f.write("\n")
-                    f.flush()
-                    
-                    # Delete image after processing to save space
-                    try:
-                        img_path.unlink()
-                    except:
-                        pass
-                    
-                    page_num += 1
-                
-                # Clean up batch
-                gc.collect()
-                time.sleep(1)
+
+                    text = ""
+                    if preprocessed is not None:
+                        try:
+                            text = ocr_engine.extract_text(preprocessed)
+                        except Exception as e:
+                            logger.error(f"  Error on page {current_page}: {e}")
+                    page_queue.put((current_page, text))
+
+                    # Delete the source image as soon as OCR is done so the
+                    # disk footprint stays at roughly one batch
+                    Path(img_path).unlink(missing_ok=True)
+
+                prep_thread.join()
+
+                # Pad any tail pages the converter failed to render: a
+                # partial batch would otherwise leave gaps in the page
+                # numbering, the writer would wait on them forever, and the
+                # final sentinel would discard every later page still
+                # sitting in its reorder heap
+                for missing_page in range(page_num + len(image_paths),
+                                          batch_end + 1):
+                    page_queue.put((missing_page, ""))
+
+                page_num = batch_end + 1
+
+            page_queue.put(None)
+            writer.join()
         
         logger.info(f"\n✓ Raw text saved: {output_raw}")
         
-        # Clean text
+        # Clean text in a single streaming pass (~64 KiB at a time) instead
+        # of loading the whole raw file into memory. Blocks end on line
+        # boundaries so the normalizer's edge-stripping stays safe.
         logger.info("Cleaning text...")
-        with open(output_raw, 'r', encoding='utf-8') as f:
-            raw_text = f.read()
-        
         normalizer = ArabicNormalizer()
-        clean_text = normalizer.normalize(raw_text)
-        
-        with open(output_clean, 'w', encoding='utf-8') as f:
-            f.write(clean_text)
+
+        with open(output_raw, 'r', encoding='utf-8') as fi, \
+                open(output_clean, 'w', encoding='utf-8', buffering=1 << 20) as fo:
+            block = []
+            block_size = 0
+            for line in fi:
+                block.append(line)
+                block_size += len(line)
+                if block_size >= 65536:
+                    fo.write(normalizer.normalize_for_storage(''.join(block)))
+                    fo.write('\n')
+                    block = []
+                    block_size = 0
+            if block:
+                fo.write(normalizer.normalize_for_storage(''.join(block)))
+                fo.write('\n')
         
         logger.info(f"✓ Clean text saved: {output_clean}")
         
@@ -245,8 +334,7 @@ def main():
         
         if process_pdf_in_batches(pdf_path, output_raw, output_clean):
             success += 1
-        
-        time.sleep(2)
+
         gc.collect()
     
     logger.info(f"\n{'='*70}")
@@ -55,20 +55,14 @@ def process_single_page(image_path, preprocessor, ocr_engine, page_num):
         
         # Preprocess
         preprocessed = preprocessor.preprocess(image)
-        del image
-        
+
         # OCR
         text = ocr_engine.extract_text(preprocessed)
-        del preprocessed
-        
-        # Force cleanup
-        gc.collect()
-        
+
         return text
         
     except Exception as e:
         logger.error(f"Error on page {page_num}: {e}")
-        gc.collect()
         return ""
 
 
@@ -115,10 +109,6 @@ def process_pdf_robust(pdf_path, output_raw, output_clean):
                 f.write("\n")
                 f.flush()  # Force write to disk
                 
-                # Pause briefly to let system recover
-                if i % 5 == 0:
-                    time.sleep(1)
-                    gc.collect()
         
         logger.info(f"Raw text saved: {output_raw}")
         
@@ -128,7 +118,7 @@ def process_pdf_robust(pdf_path, output_raw, output_clean):
             raw_text = f.read()
         
         normalizer = ArabicNormalizer()
-        clean_text = normalizer.normalize(raw_text)
+        clean_text = normalizer.normalize_for_storage(raw_text)
         
         # Step 4: Save clean text
         with open(output_clean, 'w', encoding='utf-8') as f:
@@ -17,6 +17,7 @@ DATA_DIR = BASE_DIR / "data"
 TEXT_CLEAN_DIR = DATA_DIR / "text_clean"
 VECTOR_STORE_DIR = BASE_DIR / "vector_store"
 VECTOR_STORE_DIR.mkdir(exist_ok=True)
+EMBEDDING_CACHE_DIR = VECTOR_STORE_DIR / "embedding_cache"
 
 # ==================== API KEYS ====================
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
@@ -29,6 +30,7 @@ if not OPENROUTER_API_KEY:
 EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"  # Free multilingual embedding model
 EMBEDDING_DIMENSION = 768  # Embedding dimension
 BATCH_SIZE = 32  # Batch size for embedding generation
+EMBEDDING_BATCH_SIZE = 64  # Chunks embedded and pushed into FAISS per indexing batch
 
 # ==================== CHUNKING SETTINGS ====================
 CHUNK_SIZE = 512  # Characters per chunk
@@ -39,6 +41,20 @@ MIN_CHUNK_SIZE = 100  # Minimum chunk size
 TOP_K_RETRIEVAL = 5  # Number of chunks to retrieve
 MIN_SCORE = 0.3  # Minimum similarity score
 
+# ==================== CACHING SETTINGS ====================
+ANSWER_CACHE_SIZE = 256  # Exact-match answer cache entries (LRU)
+SEMANTIC_CACHE_SIZE = 1024  # Query embeddings kept for semantic answer reuse
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Min cosine similarity for a semantic cache hit
+SEMANTIC_CACHE_MIN_JACCARD = 0.8  # Min top-k chunk overlap to trust a cached answer
+
+# ==================== STREAMING SETTINGS ====================
+STREAM_BATCH_SIZE = 6  # LLM chunks buffered per streamed yield
+STREAM_FLUSH_MS = 50  # Max milliseconds to hold buffered chunks before yielding
+
+# ==================== CONCURRENCY SETTINGS ====================
+MAX_CONCURRENT_QUERIES = 4  # Parallel questions in batch_query
+CONCURRENCY_MODE = "server"  # "server": 1 FAISS thread per search; "batch": FAISS default
+
 # ==================== LLM SETTINGS ====================
 LLM_MODEL = "google/gemini-2.0-flash-exp:free"  # OpenRouter model name
 MAX_OUTPUT_TOKENS = 2048
@@ -77,6 +93,7 @@ class RAGConfig:
         self.data_dir = DATA_DIR
         self.text_clean_dir = str(TEXT_CLEAN_DIR)
         self.vector_store_path = str(VECTOR_STORE_DIR)
+        self.embedding_cache_path = str(EMBEDDING_CACHE_DIR)
         
         # API Keys (only for LLM, embeddings use local model)
         self.openrouter_api_key = OPENROUTER_API_KEY
@@ -86,6 +103,7 @@ class RAGConfig:
         self.embedding_model = EMBEDDING_MODEL
         self.embedding_dimension = EMBEDDING_DIMENSION
         self.batch_size = BATCH_SIZE
+        self.embedding_batch_size = EMBEDDING_BATCH_SIZE
         
         # Chunking settings
         self.chunk_size = CHUNK_SIZE
@@ -95,6 +113,20 @@ class RAGConfig:
         # Vector store settings
         self.top_k = TOP_K_RETRIEVAL
         self.min_score = MIN_SCORE
+
+        # Caching settings
+        self.answer_cache_size = ANSWER_CACHE_SIZE
+        self.semantic_cache_size = SEMANTIC_CACHE_SIZE
+        self.semantic_cache_threshold = SEMANTIC_CACHE_THRESHOLD
+        self.semantic_cache_min_jaccard = SEMANTIC_CACHE_MIN_JACCARD
+
+        # Streaming settings
+        self.stream_batch_size = STREAM_BATCH_SIZE
+        self.stream_flush_ms = STREAM_FLUSH_MS
+
+        # Concurrency settings
+        self.max_concurrent_queries = MAX_CONCURRENT_QUERIES
+        self.concurrency_mode = CONCURRENCY_MODE
         
         # LLM settings
         self.llm_model = LLM_MODEL
@@ -4,34 +4,85 @@ Sentence Transformers Embeddings Generator
 Handles text embedding generation using Hugging Face sentence-transformers (free, local).
 """
 
+import hashlib
 import logging
+import threading
 import time
-from typing import List, Dict
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Optional
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# Process-wide model cache: loading the multilingual MPNet weights costs
+# seconds and ~1 GB of RAM, so every GeminiEmbeddings instance with the
+# same model name shares one SentenceTransformer (encode is thread-safe).
+_MODEL_CACHE: Dict[str, SentenceTransformer] = {}
+
+# Entries kept in the per-instance in-memory embedding cache (LRU)
+_MEMORY_CACHE_SIZE = 2048
+
+
+def _detect_device() -> str:
+    """Pick the best available device for the embedding model."""
+    if torch.cuda.is_available():
+        return "cuda"
+    if getattr(torch.backends, "mps", None) and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
 
 class GeminiEmbeddings:
     """
     Generates embeddings using Sentence Transformers (multilingual support for Arabic).
     """
     
-    def __init__(self, api_key: str = None, model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2", 
-                 base_url: str = None):
+    def __init__(self, api_key: str = None, model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
+                 base_url: str = None, cache_dir: Optional[Path] = None):
         """
         Initialize Sentence Transformers embeddings (local, free).
-        
+
         Args:
             api_key: Not used, kept for compatibility
             model: Sentence transformer model name
             base_url: Not used, kept for compatibility
+            cache_dir: Optional directory for a content-addressed embedding
+                      cache (one .npy file per unique text)
         """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Embedding cache enabled at: {self.cache_dir}")
+
+        # In-memory LRU in front of the model (and the disk cache), keyed by
+        # content hash; repeated queries skip the forward pass entirely.
+        # The lock keeps the get/move_to_end and put/evict pairs atomic when
+        # queries arrive from several threads.
+        self._memory_cache = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
         self.model_name = model
-        logger.info(f"Loading Sentence Transformer model: {model}")
-        self.model = SentenceTransformer(model)
-        logger.info(f"Embeddings model loaded successfully")
+        self.device = _detect_device()
+
+        if model in _MODEL_CACHE:
+            logger.info(f"Reusing cached Sentence Transformer model: {model}")
+            self.model = _MODEL_CACHE[model]
+        else:
+            logger.info(f"Loading Sentence Transformer model: {model} (device: {self.device})")
+            self.model = SentenceTransformer(model, device=self.device)
+
+            # Run the forward pass in reduced precision where the hardware supports
+            # it; encode(convert_to_numpy=True) still returns float32 embeddings.
+            if self.device == "cuda":
+                self.model.half()
+                logger.info("Using FP16 inference on CUDA")
+            elif self.device == "cpu":
+                torch.set_float32_matmul_precision("high")
+
+            _MODEL_CACHE[model] = self.model
+            logger.info(f"Embeddings model loaded successfully")
     
     def embed_text(self, text: str) -> List[float]:
         """
@@ -43,56 +94,123 @@ class GeminiEmbeddings:
         Returns:
             Embedding vector
         """
+        key = self._cache_key(text)
+        cached = self._memory_cache_get(key)
+        if cached is not None:
+            return cached.tolist()
+
         try:
             embedding = self.model.encode(text, convert_to_numpy=True)
+            self._memory_cache_put(key, embedding)
             return embedding.tolist()
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
             raise
     
-    def embed_texts(self, texts: List[str], batch_size: int = 32, 
-                   show_progress: bool = True) -> List[List[float]]:
+    def embed_texts(self, texts: List[str], batch_size: int = 32,
+                   show_progress: bool = True) -> np.ndarray:
         """
         Generate embeddings for multiple texts.
-        
+
         Args:
             texts: List of input texts
-            batch_size: Number of texts per batch
+            batch_size: Number of texts per batch (passed to the model)
             show_progress: Show progress information
-            
+
         Returns:
-            List of embedding vectors
+            Embedding matrix as float32 numpy array (num_texts, dimension)
         """
-        embeddings = []
         total = len(texts)
-        
+
         logger.info(f"Generating embeddings for {total} texts...")
-        
-        for i in range(0, total, batch_size):
-            batch = texts[i:i + batch_size]
-            batch_end = min(i + batch_size, total)
-            
-            if show_progress:
-                logger.info(f"Processing batch {i//batch_size + 1}: texts {i+1}-{batch_end}/{total}")
-            
-            try:
-                # Encode batch at once (much faster)
-                batch_embeddings = self.model.encode(batch, convert_to_numpy=True, show_progress_bar=False)
-                embeddings.extend([emb.tolist() for emb in batch_embeddings])
-            except Exception as e:
-                logger.error(f"Failed to embed batch: {e}")
-                # Fallback: embed individually
-                for text in batch:
-                    try:
-                        embedding = self.embed_text(text)
-                        embeddings.append(embedding)
-                    except Exception as e2:
-                        logger.error(f"Failed to embed text: {e2}")
-                        # Use zero vector as fallback
-                        embeddings.append([0.0] * 768)
-        
+
+        if self.cache_dir is None or total == 0:
+            embeddings = self._encode(texts, batch_size, show_progress)
+        else:
+            rows = [None] * total
+            miss_texts = []
+            miss_indices = []
+
+            for i, text in enumerate(texts):
+                key = self._cache_key(text)
+                cached = self._memory_cache_get(key)
+                if cached is not None:
+                    rows[i] = cached
+                    continue
+                cache_path = self.cache_dir / f"{key}.npy"
+                if cache_path.exists():
+                    rows[i] = np.load(cache_path)
+                    self._memory_cache_put(key, rows[i])
+                else:
+                    miss_texts.append(text)
+                    miss_indices.append(i)
+
+            logger.info(f"Embedding cache: {total - len(miss_texts)} hits, {len(miss_texts)} misses")
+
+            if miss_texts:
+                new_embeddings = self._encode(miss_texts, batch_size, show_progress)
+                for idx, vector, text in zip(miss_indices, new_embeddings, miss_texts):
+                    rows[idx] = vector
+                    key = self._cache_key(text)
+                    self._memory_cache_put(key, vector)
+                    np.save(self.cache_dir / f"{key}.npy", vector)
+
+            embeddings = np.vstack(rows).astype(np.float32)
+
         logger.info(f"Generated {len(embeddings)} embeddings")
         return embeddings
+
+    def _memory_cache_get(self, key: str) -> Optional[np.ndarray]:
+        """Fetch a vector from the in-memory LRU cache."""
+        with self._memory_cache_lock:
+            vector = self._memory_cache.get(key)
+            if vector is not None:
+                self._memory_cache.move_to_end(key)
+            return vector
+
+    def _memory_cache_put(self, key: str, vector: np.ndarray) -> None:
+        """Store a vector in the in-memory LRU cache, evicting the oldest."""
+        with self._memory_cache_lock:
+            self._memory_cache[key] = vector
+            while len(self._memory_cache) > _MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Content hash used as cache filename (blake2b: fast on short strings)."""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _encode(self, texts: List[str], batch_size: int,
+                show_progress: bool) -> np.ndarray:
+        """Encode texts with the model, with a per-text fallback on failure."""
+        try:
+            # Sort by length so each batch pads to a similar sequence length
+            # instead of the longest chunk in document order, then scatter
+            # the embeddings back to the original order.
+            order = np.argsort([len(t) for t in texts])
+            sorted_embeddings = self.model.encode(
+                [texts[i] for i in order],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=show_progress
+            )
+            embeddings = np.empty_like(sorted_embeddings)
+            embeddings[order] = sorted_embeddings
+        except Exception as e:
+            logger.error(f"Failed to embed batch: {e}")
+            # Fallback: embed individually
+            rows = []
+            for text in texts:
+                try:
+                    rows.append(self.model.encode(text, convert_to_numpy=True))
+                except Exception as e2:
+                    logger.error(f"Failed to embed text: {e2}")
+                    # Use zero vector as fallback
+                    rows.append(np.zeros(768, dtype=np.float32))
+            embeddings = np.vstack(rows).astype(np.float32)
+
+        return embeddings
     
     def embed_query(self, query: str) -> List[float]:
         """
@@ -110,16 +228,16 @@ class GeminiEmbeddings:
     def embed_chunks(self, chunks: List[Dict]) -> List[Dict]:
         """
         Embed text chunks and attach embeddings to metadata.
-        
+
         Args:
             chunks: List of chunk dictionaries
-            
+
         Returns:
-            Chunks with added 'embedding' field
+            Chunks with added 'embedding' field (float32 numpy row)
         """
         texts = [chunk["text"] for chunk in chunks]
         embeddings = self.embed_texts(texts)
-        
+
         for chunk, embedding in zip(chunks, embeddings):
             chunk["embedding"] = embedding
         
@@ -240,12 +240,18 @@ class GeminiLLM:
                        system_prompt_template: str = None) -> str:
         """
         Answer a question using provided context.
-        
+
+        Prompt-prefix contract: the template places the fixed system prompt
+        first, then the context (chunks sorted by stable ID upstream), and
+        the question last. Requests sharing a retrieval set therefore share
+        a byte-identical prefix, which lets prefix-caching backends (e.g.
+        vLLM automatic prefix caching) skip most of the prefill.
+
         Args:
             question: User question
             context: Retrieved context
             system_prompt_template: Template with {context} and {question} placeholders
-            
+
         Returns:
             Answer text
         """
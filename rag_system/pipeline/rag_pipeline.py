@@ -4,19 +4,30 @@ Complete RAG Pipeline
 Orchestrates retrieval-augmented generation flow.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Optional, Generator
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import AsyncGenerator, List, Dict, Optional, Generator
 from pathlib import Path
 
+import faiss
+import numpy as np
+
 from ..config import RAGConfig
 from ..chunking.text_chunker import TextChunker
-from ..embeddings.gemini_embeddings import GeminiEmbeddings
-from ..vector_store.faiss_store import FAISSVectorStore
-from ..retrieval.retriever import RetrievalEngine
-from ..llm.gemini_llm import GeminiLLM
 
 logger = logging.getLogger(__name__)
 
+# Result keys lifted to the top level of each source entry; everything else
+# lands in its metadata dict
+_EXCLUDE_KEYS = frozenset({"text", "score"})
+
 
 class RAGPipeline:
     """
@@ -31,36 +42,91 @@ class RAGPipeline:
             config: RAG configuration
         """
         self.config = config or RAGConfig()
-        
-        # Initialize components
+
+        # Lightweight components only; the embedding model, vector store and
+        # LLM client are cached_property instances created on first access
         self.chunker = TextChunker(
             chunk_size=self.config.chunk_size,
             overlap=self.config.chunk_overlap
         )
-        
-        self.embeddings = GeminiEmbeddings(
-            model=self.config.embedding_model
+
+        # Exact-match answer cache keyed on the normalized question (LRU)
+        self._answer_cache = OrderedDict()
+
+        # Semantic cache: FAISS index of recent query embeddings, with a
+        # parallel list of cached entries (vector kept for rebuilds)
+        self._semantic_cache_index = faiss.IndexFlatIP(self.config.embedding_dimension)
+        self._semantic_cache_entries = []
+
+        # Guards both caches: batch_query and the async entry points run
+        # query() from several threads, and neither the OrderedDict LRU
+        # dance nor FAISS add/search (or the eviction's index swap) is safe
+        # under concurrent mutation
+        self._cache_lock = threading.Lock()
+
+        # In server mode concurrent request threads each run their own FAISS
+        # search; one OpenMP worker per search avoids the threads fighting
+        # over cores. batch_query widens this temporarily.
+        if self.config.concurrency_mode == "server":
+            faiss.omp_set_num_threads(1)
+
+        logger.info("RAG pipeline initialized")
+
+    @contextmanager
+    def _faiss_batch_threads(self):
+        """Let FAISS use all cores for a batch, then restore server mode."""
+        if self.config.concurrency_mode != "server":
+            yield
+            return
+        faiss.omp_set_num_threads(os.cpu_count() or 1)
+        try:
+            yield
+        finally:
+            faiss.omp_set_num_threads(1)
+
+    # Heavy components are built lazily so callers pay only for what they
+    # use: index_documents never constructs the LLM client, and a query
+    # answered from the cache never loads the embedding model. Imports are
+    # deferred with the constructors (sentence-transformers pulls in torch).
+
+    @cached_property
+    def embeddings(self):
+        """Local embedding model (multi-second load), created on first use."""
+        from ..embeddings.gemini_embeddings import GeminiEmbeddings
+        return GeminiEmbeddings(
+            model=self.config.embedding_model,
+            cache_dir=Path(self.config.embedding_cache_path)
         )
-        
-        self.vector_store = FAISSVectorStore(
+
+    @cached_property
+    def vector_store(self):
+        """FAISS vector store, created on first use."""
+        from ..vector_store.faiss_store import FAISSVectorStore
+        return FAISSVectorStore(
             dimension=self.config.embedding_dimension
         )
-        
-        self.retriever = RetrievalEngine(
+
+    @cached_property
+    def retriever(self):
+        """Retrieval engine over the (lazily built) embedder and store."""
+        from ..retrieval.retriever import RetrievalEngine
+        return RetrievalEngine(
             embedder=self.embeddings,
             vector_store=self.vector_store
         )
-        
-        self.llm = GeminiLLM(
+
+    @cached_property
+    def llm(self):
+        """OpenRouter LLM client, created on first use."""
+        from ..llm.gemini_llm import GeminiLLM
+        return GeminiLLM(
             api_key=self.config.openrouter_api_key,
             model=self.config.llm_model,
             max_output_tokens=self.config.max_output_tokens,
             temperature=self.config.temperature,
             base_url=self.config.openrouter_base_url
         )
-        
-        logger.info("RAG pipeline initialized")
-    
+
     def index_documents(self, text_dir: str) -> None:
         """
         Index all documents in directory.
@@ -82,45 +148,59 @@ class RAGPipeline:
             logger.warning("No chunks created - check document directory")
             return
         
-        # Generate embeddings
+        # Embed and index in fixed-size batches so peak memory stays at one
+        # batch of vectors instead of the whole corpus
         logger.info("Generating embeddings...")
-        vectors = self.embeddings.embed_texts(chunks)
-        logger.info(f"Generated {len(vectors)} embeddings")
-        
-        # Add to vector store
-        self.vector_store.add_vectors(vectors, chunks, metadata)
+        batch_size = self.config.embedding_batch_size
+        for i in range(0, len(chunks), batch_size):
+            batch = chunks[i:i + batch_size]
+            vectors = self.embeddings.embed_texts(batch, show_progress=False)
+            self.vector_store.add_vectors(vectors, batch, metadata[i:i + batch_size])
+            logger.info(f"Indexed {min(i + batch_size, len(chunks))}/{len(chunks)} chunks")
+
+        # Cached answers may reference stale chunks after re-indexing
+        self.invalidate_cache()
+
         logger.info("Documents indexed successfully")
     
     def save_index(self, path: str) -> None:
         """
-        Save vector index to disk.    
+        Save vector index to disk.
             path: Directory to save index
         """
-        from pathlib import Path
         path_obj = Path(path)
         path_obj.mkdir(parents=True, exist_ok=True)
-        
+
         logger.info(f"Saving index to: {path}")
-        self.vector_store.index_path = path_obj / "index.faiss"
-        self.vector_store.metadata_path = path_obj / "metadata.json"
+        self._set_store_paths(path_obj)
         self.vector_store.save()
         logger.info("Index saved successfully")
-    
+
     def load_index(self, path: str) -> None:
         """
         Load vector index from disk.
-        
+
         Args:
             path: Directory with saved index
         """
-        from pathlib import Path
         path_obj = Path(path)
-        
+
         logger.info(f"Loading index from: {path}")
-        self.vector_store.index_path = path_obj / "index.faiss"
-        self.vector_store.metadata_path = path_obj / "metadata.json"
+        self._set_store_paths(path_obj)
         self.vector_store.load()
         logger.info(f"Index loaded with {len(self.vector_store.texts)} documents")
+
+    def _set_store_paths(self, path_obj: Path) -> None:
+        """Point the vector store at a directory, only writing on change.
+
+        Keeping the paths stable matters beyond the saved attribute writes:
+        the index file is mmapped read-only, so it must stay at the same
+        location across repeated loads.
+        """
+        index_path = path_obj / "index.faiss"
+        if self.vector_store.index_path != index_path:
+            self.vector_store.index_path = index_path
+            self.vector_store.metadata_path = path_obj / "metadata.json"
     
     def query(self, question: str, return_context: bool = False) -> Dict:
         """
@@ -134,10 +214,37 @@ class RAGPipeline:
             Dict with answer and optionally context
         """
         logger.info(f"Processing query: {question[:50]}...")
-        
+
+        # Serve literal repeats straight from the answer cache
+        from ..retrieval.retriever import normalize_arabic_text
+        cache_key = normalize_arabic_text(question)
+        with self._cache_lock:
+            cached = self._answer_cache.get(cache_key)
+            if cached is not None:
+                self._answer_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info("Answer cache hit")
+            return self._build_response(question, cached, return_context)
+
+        # Embed the question once; reused for retrieval and the semantic cache
+        query_vector = np.asarray(
+            self.embeddings.embed_query(question), dtype=np.float32
+        ).reshape(1, -1)
+        faiss.normalize_L2(query_vector)
+
         # Retrieve relevant context
-        context, results = self.retriever.retrieve_and_format(question)
-        
+        context, results = self.retriever.retrieve_and_format(
+            question, query_embedding=query_vector[0]
+        )
+
+        # Semantic cache: a near-identical earlier query whose retrieval hit
+        # mostly the same chunks can be answered without an LLM call
+        chunk_ids = {r.get("id") for r in results}
+        cached = self._semantic_cache_lookup(query_vector, chunk_ids)
+        if cached is not None:
+            logger.info("Semantic cache hit")
+            return self._build_response(question, cached, return_context)
+
         if not context or context == "لا توجد معلومات ذات صلة.":
             answer = "عذراً، لم أجد معلومات كافية للإجابة على هذا السؤال في المراجع المتاحة."
         else:
@@ -147,25 +254,95 @@ class RAGPipeline:
                 context=context,
                 system_prompt_template=self.config.system_prompt
             )
-        
-        response = {
-            "question": question,
-            "answer": answer
-        }
-        
-        if return_context:
-            response["context"] = context
-            response["sources"] = [
+
+        entry = {
+            "answer": answer,
+            "context": context,
+            "sources": [
                 {
                     "text": r.get("text", ""),
                     "score": r.get("score", 0.0),
-                    "metadata": {k: v for k, v in r.items() if k not in ["text", "score"]}
+                    "metadata": {k: r[k] for k in r.keys() - _EXCLUDE_KEYS}
                 }
                 for r in results
             ]
-        
+        }
+
+        with self._cache_lock:
+            self._answer_cache[cache_key] = entry
+            while len(self._answer_cache) > self.config.answer_cache_size:
+                self._answer_cache.popitem(last=False)
+
+        self._semantic_cache_insert(query_vector, chunk_ids, entry)
+
         logger.info("Query processed successfully")
+        return self._build_response(question, entry, return_context)
+
+    def _semantic_cache_lookup(self, query_vector: np.ndarray,
+                               chunk_ids: set) -> Optional[Dict]:
+        """
+        Look up a cached answer for a semantically equivalent query.
+
+        A hit requires both cosine similarity above the configured threshold
+        and sufficient Jaccard overlap between the cached and current top-k
+        chunk IDs, so answers grounded in different context are never reused.
+        """
+        with self._cache_lock:
+            if self._semantic_cache_index.ntotal == 0:
+                return None
+
+            scores, indices = self._semantic_cache_index.search(query_vector, 1)
+            score, idx = float(scores[0][0]), int(indices[0][0])
+
+            if idx < 0 or score < self.config.semantic_cache_threshold:
+                return None
+
+            entry = self._semantic_cache_entries[idx]
+        union = entry["chunk_ids"] | chunk_ids
+        jaccard = len(entry["chunk_ids"] & chunk_ids) / len(union) if union else 1.0
+
+        if jaccard < self.config.semantic_cache_min_jaccard:
+            return None
+
+        return entry
+
+    def _semantic_cache_insert(self, query_vector: np.ndarray,
+                               chunk_ids: set, entry: Dict) -> None:
+        """Record a query embedding and its answer for semantic reuse."""
+        entry["chunk_ids"] = chunk_ids
+        entry["query_vector"] = query_vector
+
+        with self._cache_lock:
+            if len(self._semantic_cache_entries) >= self.config.semantic_cache_size:
+                # Drop the older half and rebuild the (small) index
+                keep = self._semantic_cache_entries[len(self._semantic_cache_entries) // 2:]
+                self._semantic_cache_index = faiss.IndexFlatIP(self.config.embedding_dimension)
+                if keep:
+                    self._semantic_cache_index.add(np.vstack([e["query_vector"] for e in keep]))
+                self._semantic_cache_entries = keep
+
+            self._semantic_cache_index.add(query_vector)
+            self._semantic_cache_entries.append(entry)
+
+    @staticmethod
+    def _build_response(question: str, entry: Dict, return_context: bool) -> Dict:
+        """Build a query response dict from a (possibly cached) entry."""
+        response = {
+            "question": question,
+            "answer": entry["answer"]
+        }
+        if return_context:
+            response["context"] = entry["context"]
+            response["sources"] = entry["sources"]
         return response
+
+    def invalidate_cache(self) -> None:
+        """Drop cached answers (call after re-indexing to avoid stale results)."""
+        with self._cache_lock:
+            self._answer_cache.clear()
+            self._semantic_cache_index = faiss.IndexFlatIP(self.config.embedding_dimension)
+            self._semantic_cache_entries = []
+        logger.info("Answer cache invalidated")
     
     def batch_query(self, questions: List[str]) -> List[Dict]:
         """
@@ -178,7 +355,12 @@ class RAGPipeline:
             List of answer dicts
         """
         logger.info(f"Processing {len(questions)} questions")
-        return [self.query(q) for q in questions]
+
+        # Each query is dominated by the remote LLM call, which releases the
+        # GIL while waiting, so a thread pool scales throughput with workers
+        with self._faiss_batch_threads():
+            with ThreadPoolExecutor(max_workers=self.config.max_concurrent_queries) as executor:
+                return list(executor.map(self.query, questions))
 
     def stream_query(self, question: str) -> Generator[str, None, None]:
         """
@@ -202,12 +384,67 @@ class RAGPipeline:
             yield "عذراً، لم أجد معلومات كافية للإجابة على هذا السؤال في المراجع المتاحة."
             return
         
-        # Generate answer with streaming - let errors propagate
+        # Generate answer with streaming - let errors propagate. Chunks are
+        # coalesced before yielding: each yield costs a serialization and an
+        # ASGI send downstream, so forwarding every token individually is
+        # mostly overhead. A small size/time budget keeps latency invisible.
+        buffer = []
+        flush_interval = self.config.stream_flush_ms / 1000.0
+        last_flush = time.monotonic()
+
         for chunk in self.llm.stream_answer_question(
             question=question,
             context=context,
             system_prompt_template=self.config.system_prompt
         ):
-            yield chunk
-        
+            buffer.append(chunk)
+            now = time.monotonic()
+            if len(buffer) >= self.config.stream_batch_size or now - last_flush >= flush_interval:
+                yield ''.join(buffer)
+                buffer = []
+                last_flush = now
+
+        if buffer:
+            yield ''.join(buffer)
+
         logger.info("Streaming query processed successfully")
+
+    async def aquery(self, question: str, return_context: bool = False) -> Dict:
+        """
+        Async counterpart of query().
+
+        Runs the synchronous pipeline in a worker thread so an asyncio event
+        loop (e.g. the FastAPI backend) is not blocked during retrieval and
+        the remote LLM call.
+
+        Args:
+            question: User question
+            return_context: Whether to return retrieved context
+
+        Returns:
+            Dict with answer and optionally context
+        """
+        return await asyncio.to_thread(self.query, question, return_context)
+
+    async def astream_query(self, question: str) -> AsyncGenerator[str, None]:
+        """
+        Async counterpart of stream_query().
+
+        Pulls chunks from the synchronous generator on a worker thread, so
+        other requests keep running on the event loop between chunks.
+
+        Args:
+            question: User question
+
+        Yields:
+            Answer text chunks
+        """
+        loop = asyncio.get_running_loop()
+        generator = self.stream_query(question)
+        sentinel = object()
+
+        while True:
+            chunk = await loop.run_in_executor(None, next, generator, sentinel)
+            if chunk is sentinel:
+                break
+            yield chunk
@@ -58,15 +58,17 @@ class RetrievalEngine:
         self.min_score = min_score
         logger.info("RetrievalEngine initialized")
     
-    def retrieve(self, query: str, top_k: int = None, min_score: float = None) -> List[Dict]:
+    def retrieve(self, query: str, top_k: int = None, min_score: float = None,
+                 query_embedding=None) -> List[Dict]:
         """
         Retrieve relevant context for a query.
-        
+
         Args:
             query: User question
             top_k: Number of results to return (uses default if None)
             min_score: Minimum similarity score threshold (uses default if None)
-            
+            query_embedding: Precomputed query vector (embedded here if None)
+
         Returns:
             List of relevant chunks with metadata
         """
@@ -74,11 +76,12 @@ class RetrievalEngine:
             top_k = self.top_k
         if min_score is None:
             min_score = self.min_score
-            
+
         logger.info(f"Retrieving context for query: {query[:50]}...")
-        
-        # Generate query embedding
-        query_embedding = self.embedder.embed_query(query)
+
+        # Generate query embedding unless the caller already has one
+        if query_embedding is None:
+            query_embedding = self.embedder.embed_query(query)
         
         # Search vector store
         results = self.vector_store.search(query_embedding, top_k=top_k)
@@ -102,7 +105,12 @@ class RetrievalEngine:
         """
         if not results:
             return "لا توجد معلومات متاحة."
-        
+
+        # Order chunks by stable ID, not similarity score: queries that hit
+        # the same retrieval set then produce an identical context block, so
+        # prefix-caching LLM backends can reuse the prompt KV cache
+        results = sorted(results, key=lambda r: r.get('id', 0))
+
         context_parts = []
         for i, result in enumerate(results, 1):
             text = result.get('text', '')
@@ -116,18 +124,20 @@ class RetrievalEngine:
         
         return "\n".join(context_parts)
     
-    def retrieve_and_format(self, query: str, top_k: int = 5) -> Tuple[str, List[Dict]]:
+    def retrieve_and_format(self, query: str, top_k: int = 5,
+                            query_embedding=None) -> Tuple[str, List[Dict]]:
         """
         Retrieve and format context in one step.
-        
+
         Args:
             query: User question
             top_k: Number of results
-            
+            query_embedding: Precomputed query vector (optional)
+
         Returns:
             Tuple of (formatted_context, raw_results)
         """
-        results = self.retrieve(query, top_k=top_k)
+        results = self.retrieve(query, top_k=top_k, query_embedding=query_embedding)
         context = self.format_context(results)
         return context, results
 
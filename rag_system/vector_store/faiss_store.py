@@ -35,7 +35,11 @@ class FAISSVectorStore:
         
         # Create FAISS index (using cosine similarity)
         self.index = faiss.IndexFlatIP(dimension)  # Inner product for normalized vectors
-        
+
+        # True while self.index is a read-only memory map of index_path;
+        # mutating or rewriting it requires materializing a RAM copy first
+        self._mmapped = False
+
         # Store text and metadata for each vector
         self.texts = []
         self.metadata = []
@@ -61,8 +65,9 @@ class FAISSVectorStore:
         
         # Get current index size (for ID assignment)
         start_id = self.index.ntotal
-        
+
         # Add to FAISS index
+        self._ensure_writable()
         self.index.add(vectors)
         
         # Store texts and metadata with IDs
@@ -111,10 +116,24 @@ class FAISSVectorStore:
         logger.debug(f"Found {len(results)} results")
         return results
     
+    def _ensure_writable(self):
+        """Materialize an in-RAM copy of the index if it is an mmap.
+
+        A read-only mmapped index cannot be appended to, and rewriting its
+        backing file while it is still mapped risks a SIGBUS on later
+        searches, so any mutation or save first clones it into RAM (which
+        also drops the mapping once the old object is released).
+        """
+        if self._mmapped:
+            self.index = faiss.clone_index(self.index)
+            self._mmapped = False
+            logger.info("Materialized in-RAM copy of mmapped index for writing")
+
     def save(self):
         """Save index and metadata to disk."""
         if self.index_path and self.metadata_path:
             # Save FAISS index
+            self._ensure_writable()
             faiss.write_index(self.index, str(self.index_path))
             logger.info(f"Saved FAISS index to {self.index_path}")
             
@@ -131,7 +150,19 @@ class FAISSVectorStore:
     def load(self):
         """Load index and metadata from disk."""
         if self.index_path and self.index_path.exists():
-            self.index = faiss.read_index(str(self.index_path))
+            # Memory-map the index read-only instead of copying it into RAM:
+            # load becomes near-instant and pages are faulted in on demand.
+            # The file must stay at this path for the process lifetime.
+            try:
+                self.index = faiss.read_index(
+                    str(self.index_path),
+                    faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+                self._mmapped = True
+            except RuntimeError:
+                # Some index types cannot be mmapped; fall back to a full read
+                self.index = faiss.read_index(str(self.index_path))
+                self._mmapped = False
             logger.info(f"Loaded FAISS index from {self.index_path} ({self.index.ntotal} vectors)")
         else:
             logger.warning(f"Index file not found: {self.index_path}")
@@ -158,6 +189,7 @@ class FAISSVectorStore:
     def clear(self):
         """Clear all vectors and metadata."""
         self.index = faiss.IndexFlatIP(self.dimension)
+        self._mmapped = False
         self.metadata = []
         self.id_to_metadata = {}
         logger.info("Cleared vector store")
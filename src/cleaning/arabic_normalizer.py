@@ -12,17 +12,97 @@ from typing import Optional
 import unicodedata
 
 try:
-    import arabic_reshaper
+    from arabic_reshaper import ArabicReshaper
     from bidi.algorithm import get_display
     RESHAPING_AVAILABLE = True
 except ImportError:
     RESHAPING_AVAILABLE = False
     logging.warning("arabic_reshaper or python-bidi not available. Text reshaping disabled.")
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from src.config import TASHKEEL, CLEANING_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns shared by all instances. Keeps the hot methods free
+# of per-call pattern lookup; the non-Arabic class in particular is large.
+# Allowed ranges: Arabic block, Arabic Supplement, Arabic Extended-A,
+# Arabic Presentation Forms A/B, digits, whitespace, Arabic punctuation.
+_NON_ARABIC_RE = re.compile(
+    r'[^\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF'
+    r'0-9\s\n\r،؛؟.!]'
+)
+_MULTI_SPACE_RE = re.compile(r' +')
+_MULTI_NEWLINE_RE = re.compile(r'\n\s*\n\s*\n+')
+_LINE_TRIM_RE = re.compile(r'[ \t\r]*\n[ \t\r]*')
+_DUP_PUNCT_RE = re.compile(r'([،؛؟.!])\1+')
+_ARABIC_CHAR_RE = re.compile(r'[\u0600-\u06FF]')
+_DIGIT_RE = re.compile(r'\d')
+_PUNCT_RE = re.compile(r'[،؛؟.!]')
+# Digit conversion tables, built once (str.maketrans per call shows up on
+# megabyte-sized documents)
+_TO_EASTERN_DIGITS = str.maketrans('0123456789', '٠١٢٣٤٥٦٧٨٩')
+_TO_WESTERN_DIGITS = str.maketrans('٠١٢٣٤٥٦٧٨٩', '0123456789')
+# Cheap pre-scan gates: most already-clean chunks contain neither
+# tashkeel nor letter variants, so the substitution pass can be skipped
+_HAS_TASHKEEL_RE = re.compile('[' + re.escape(''.join(TASHKEEL)) + ']')
+_HAS_VARIANT_RE = re.compile(r'[آأإٱةؤئءى]')
+
+
+class _FusedCleanTable(dict):
+    """
+    str.translate table that fuses character normalization with deletion of
+    codepoints outside the allowed Arabic ranges.
+
+    Seeded with the normalizer's character map; any other codepoint is
+    classified on first sight in __missing__ (keep → identity mapping,
+    disallowed → None) and memoized in the table itself, so after warm-up
+    every character costs one dict hit inside a single C-level translate pass.
+    """
+
+    def __missing__(self, codepoint):
+        keep = (0x0600 <= codepoint <= 0x06FF
+                or 0x0750 <= codepoint <= 0x077F
+                or 0x08A0 <= codepoint <= 0x08FF
+                or 0xFB50 <= codepoint <= 0xFDFF
+                or 0xFE70 <= codepoint <= 0xFEFF
+                or 0x30 <= codepoint <= 0x39
+                or chr(codepoint).isspace()
+                or chr(codepoint) in '،؛؟.!')
+        result = codepoint if keep else None
+        self[codepoint] = result
+        return result
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _normalize_kernel(buf, lut, out):
+        """Single compiled pass: LUT substitution/deletion over codepoints.
+
+        Codepoints below 0x800 are resolved through the LUT (0 means drop);
+        the higher Arabic presentation-form ranges pass through unchanged.
+        Writes survivors into out and returns their count.
+        """
+        j = 0
+        for i in range(buf.size):
+            c = buf[i]
+            if c < 0x800:
+                m = lut[c]
+                if m != 0:
+                    out[j] = m
+                    j += 1
+            elif ((0x08A0 <= c <= 0x08FF)
+                    or (0xFB50 <= c <= 0xFDFF)
+                    or (0xFE70 <= c <= 0xFEFF)):
+                out[j] = c
+                j += 1
+        return j
+
 
 class ArabicNormalizer:
     """
@@ -42,56 +122,275 @@ class ArabicNormalizer:
         """
         self.config = config if config is not None else CLEANING_CONFIG
         self.tashkeel = TASHKEEL
+
+        # Precompiled translate tables: str.translate is a single C-level
+        # pass over the text, versus one full scan per str.replace call
+        self._tashkeel_table = str.maketrans('', '', ''.join(self.tashkeel))
+        self._alef_table = str.maketrans('آأإٱ', 'اااا')
+        self._teh_marbuta_table = str.maketrans('ة', 'ه')
+        self._hamza_table = str.maketrans({'ؤ': 'و', 'ئ': 'ي', 'ء': None})
+        self._yeh_table = str.maketrans('ى', 'ي')
+
+        # Fused table combining every enabled character-level step, so the
+        # hot path scans the text once instead of once per step
+        char_map = {}
+        if self.config.get("remove_tashkeel", True):
+            char_map.update({ord(mark): None for mark in self.tashkeel})
+        if self.config.get("normalize_alef", True):
+            char_map.update({ord(variant): ord('ا') for variant in 'آأإٱ'})
+        if self.config.get("normalize_teh_marbuta", True):
+            char_map[ord('ة')] = ord('ه')
+        if self.config.get("normalize_hamza", True):
+            char_map[ord('ؤ')] = ord('و')
+            char_map[ord('ئ')] = ord('ي')
+            char_map[ord('ء')] = None
+        if self.config.get("normalize_yeh", False):
+            char_map[ord('ى')] = ord('ي')
+        self._char_table = char_map
+
+        # normalize_fast: the same character map plus lazy, memoized
+        # deletion of disallowed codepoints, all in one translate pass
+        self._fused_table = _FusedCleanTable(self._char_table)
+
+        # Codepoint LUT for the optional Numba kernel (built on first use)
+        self._lut = None
+
+        # One configured reshaper for the instance lifetime: the module-level
+        # arabic_reshaper.reshape() rebuilds its configuration on every call.
+        # Ligature support is off — downstream display doesn't need ligature
+        # glyphs and skipping them trims the per-character state machine.
+        if RESHAPING_AVAILABLE:
+            self._reshaper = ArabicReshaper(configuration={
+                'delete_harakat': False,
+                'support_ligatures': False,
+            })
+        else:
+            self._reshaper = None
+
         logger.info("ArabicNormalizer initialized")
         logger.debug(f"Configuration: {self.config}")
-        
+
         if self.config.get("apply_reshaping", True) and not RESHAPING_AVAILABLE:
             logger.warning("Reshaping requested but libraries not available")
     
     def normalize(self, text: str) -> str:
         """
         Apply full normalization pipeline to Arabic text.
-        
+
         Args:
             text: Input Arabic text (raw OCR output)
-            
+
         Returns:
             Cleaned and normalized Arabic text
         """
+        text = self.normalize_for_storage(text)
+
+        # Step 5: Apply reshaping (for proper display)
+        if text and self.config.get("apply_reshaping", True) and RESHAPING_AVAILABLE:
+            text = self.reshape_text(text)
+
+        return text
+
+    def normalize_for_storage(self, text: str) -> str:
+        """
+        Normalize text for storage, indexing and embedding.
+
+        Unconditionally skips reshaping/bidi: those steps reorder the text
+        into visual glyph order, which corrupts logical order for chunking
+        and retrieval, and they dominate cleaning cost. Use
+        normalize_for_display for text shown in non-RTL terminals.
+
+        Args:
+            text: Input Arabic text (raw OCR output)
+
+        Returns:
+            Cleaned and normalized Arabic text in logical order
+        """
         if not text or not text.strip():
             return ""
-        
+
         logger.debug("Starting text normalization")
-        
-        # Step 1: Remove tashkeel (diacritics)
-        if self.config.get("remove_tashkeel", True):
-            text = self.remove_tashkeel(text)
-        
-        # Step 2: Normalize Arabic characters
-        if self.config.get("normalize_alef", True):
-            text = self.normalize_alef(text)
-        
-        if self.config.get("normalize_teh_marbuta", True):
-            text = self.normalize_teh_marbuta(text)
-        
-        if self.config.get("normalize_hamza", True):
-            text = self.normalize_hamza(text)
-        
+
+        # Steps 1-2: All character-level substitutions (tashkeel removal,
+        # alef/teh marbuta/hamza normalization) fused into one pass; skipped
+        # entirely when a pre-scan finds nothing the pass would change
+        if _HAS_TASHKEEL_RE.search(text) or _HAS_VARIANT_RE.search(text):
+            text = self._fast_char_normalize(text)
+
         # Step 3: Remove non-Arabic characters
         if self.config.get("remove_non_arabic", True):
             text = self.remove_non_arabic(text)
-        
+
         # Step 4: Clean up spaces
         if self.config.get("collapse_spaces", True):
             text = self.collapse_spaces(text)
-        
-        # Step 5: Apply reshaping (for proper display)
-        if self.config.get("apply_reshaping", True) and RESHAPING_AVAILABLE:
-            text = self.reshape_text(text)
-        
+
         logger.debug("Text normalization completed")
         return text
-    
+
+    def normalize_for_display(self, text: str) -> str:
+        """
+        Normalize text and reshape it for visual display.
+
+        Args:
+            text: Input Arabic text
+
+        Returns:
+            Cleaned text reshaped for non-RTL rendering
+        """
+        text = self.normalize_for_storage(text)
+        if text and RESHAPING_AVAILABLE:
+            text = self.reshape_text(text)
+        return text
+
+    def normalize_fast(self, text: str) -> str:
+        """
+        Bulk cleaning fast path for large OCR batches.
+
+        Equivalent to normalize_for_storage with non-Arabic removal enabled,
+        but character normalization and non-Arabic deletion are fused into a
+        single str.translate scan (see _FusedCleanTable) instead of a
+        translate pass followed by a large character-class regex pass.
+
+        Args:
+            text: Input Arabic text (raw OCR output)
+
+        Returns:
+            Cleaned and normalized Arabic text in logical order
+        """
+        if not text or not text.strip():
+            return ""
+
+        # With numba installed the whole substitution/deletion pass runs as
+        # one compiled loop over a UTF-32 view; otherwise fall back to the
+        # (still single-pass) translate table
+        if NUMBA_AVAILABLE:
+            text = self._numba_normalize(text)
+        else:
+            text = text.translate(self._fused_table)
+
+        if self.config.get("collapse_spaces", True):
+            text = self.collapse_spaces(text)
+
+        return text
+
+    def _numba_normalize(self, text: str) -> str:
+        """Run the compiled codepoint kernel over a UTF-32 view of the text."""
+        import numpy as np
+
+        if self._lut is None:
+            self._lut = self._build_lut()
+
+        buf = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        out = np.empty(buf.size, dtype=np.uint32)
+        count = _normalize_kernel(buf, self._lut, out)
+        return out[:count].tobytes().decode('utf-32-le')
+
+    def _build_lut(self):
+        """Build the codepoint lookup table for the Numba kernel.
+
+        Covers codepoints below 0x800: allowed characters map to themselves,
+        the configured substitutions map to their replacement, and 0 marks
+        deletion (matching the _FusedCleanTable semantics).
+        """
+        import numpy as np
+
+        lut = np.zeros(0x800, dtype=np.uint32)
+        for cp in range(0x800):
+            if (0x0600 <= cp <= 0x06FF
+                    or 0x0750 <= cp <= 0x077F
+                    or 0x30 <= cp <= 0x39
+                    or cp in (0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x20, 0x85, 0xA0)
+                    or cp in (0x21, 0x2E)):  # '!' and '.'
+                lut[cp] = cp
+        for cp, mapped in self._char_table.items():
+            if cp < 0x800:
+                lut[cp] = mapped if mapped is not None else 0
+        return lut
+
+    def normalize_batch(self, texts: list) -> list:
+        """
+        Normalize many texts at once with vectorized NumPy operations.
+
+        All texts are joined with a sentinel codepoint, decoded into one
+        uint32 codepoint array, and every substitution/deletion is applied
+        with masked assignments — compiled C loops over the whole corpus
+        instead of Python-level passes per text. Output matches
+        normalize_for_storage for each input.
+
+        Args:
+            texts: List of input Arabic texts
+
+        Returns:
+            List of cleaned and normalized texts, same order as the input
+        """
+        import numpy as np
+
+        if not texts:
+            return []
+
+        # Marks text boundaries below. Raw OCR output is not sanitized
+        # before this point, so strip any stray occurrences from the inputs
+        # first - an embedded delimiter would add split positions and
+        # misalign every following text/result pair
+        delim = 0x0001
+        texts = [t.replace(chr(delim), '') for t in texts]
+        joined = chr(delim).join(texts)
+        arr = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32).copy()
+
+        # Character substitutions (vectorized equivalents of _char_table)
+        if self.config.get("normalize_alef", True):
+            arr[np.isin(arr, np.array([ord(c) for c in 'آأإٱ'], dtype=np.uint32))] = ord('ا')
+        if self.config.get("normalize_teh_marbuta", True):
+            arr[arr == ord('ة')] = ord('ه')
+        if self.config.get("normalize_hamza", True):
+            arr[arr == ord('ؤ')] = ord('و')
+            arr[arr == ord('ئ')] = ord('ي')
+        if self.config.get("normalize_yeh", False):
+            arr[arr == ord('ى')] = ord('ي')
+
+        # Deletions, accumulated into one boolean keep mask
+        keep = np.ones(arr.shape, dtype=bool)
+        if self.config.get("remove_tashkeel", True):
+            keep &= ~np.isin(arr, np.array([ord(m) for m in self.tashkeel], dtype=np.uint32))
+        if self.config.get("normalize_hamza", True):
+            keep &= arr != ord('ء')
+        if self.config.get("remove_non_arabic", True):
+            allowed = (
+                ((arr >= 0x0600) & (arr <= 0x06FF))
+                | ((arr >= 0x0750) & (arr <= 0x077F))
+                | ((arr >= 0x08A0) & (arr <= 0x08FF))
+                | ((arr >= 0xFB50) & (arr <= 0xFDFF))
+                | ((arr >= 0xFE70) & (arr <= 0xFEFF))
+                | ((arr >= 0x30) & (arr <= 0x39))
+                | np.isin(arr, np.array(
+                    [0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x20] + [ord(c) for c in '،؛؟.!'],
+                    dtype=np.uint32))
+                | (arr == delim)
+            )
+            keep &= allowed
+
+        cleaned = arr[keep].tobytes().decode('utf-32-le')
+
+        if self.config.get("collapse_spaces", True):
+            return [self.collapse_spaces(piece) for piece in cleaned.split(chr(delim))]
+        return cleaned.split(chr(delim))
+
+    def _fast_char_normalize(self, text: str) -> str:
+        """
+        Apply all enabled character-level substitutions in a single pass.
+
+        The combined table is built once in __init__ from the config flags,
+        so this replaces up to five sequential scans with one translate call.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Text with all character-level normalizations applied
+        """
+        return text.translate(self._char_table)
+
     def remove_tashkeel(self, text: str) -> str:
         """
         Remove all Arabic diacritical marks (tashkeel).
@@ -104,9 +403,7 @@ class ArabicNormalizer:
         Returns:
             Text without diacritics
         """
-        for mark in self.tashkeel:
-            text = text.replace(mark, '')
-        
+        text = text.translate(self._tashkeel_table)
         logger.debug("Removed tashkeel")
         return text
     
@@ -122,12 +419,7 @@ class ArabicNormalizer:
         Returns:
             Text with normalized Alef
         """
-        # Alef variants
-        alef_variants = ['آ', 'أ', 'إ', 'ٱ']
-        
-        for variant in alef_variants:
-            text = text.replace(variant, 'ا')
-        
+        text = text.translate(self._alef_table)
         logger.debug("Normalized Alef")
         return text
     
@@ -143,7 +435,7 @@ class ArabicNormalizer:
         Returns:
             Text with normalized Teh Marbuta
         """
-        text = text.replace('ة', 'ه')
+        text = text.translate(self._teh_marbuta_table)
         logger.debug("Normalized Teh Marbuta")
         return text
     
@@ -159,13 +451,8 @@ class ArabicNormalizer:
         Returns:
             Text with normalized Hamza
         """
-        # Normalize Hamza on different carriers
-        text = text.replace('ؤ', 'و')  # Hamza on Waw → Waw
-        text = text.replace('ئ', 'ي')  # Hamza on Ya → Ya
-        
-        # Standalone Hamza variants
-        text = text.replace('ء', '')  # Remove standalone Hamza (optional)
-        
+        # Hamza on Waw → Waw, Hamza on Ya → Ya, standalone Hamza removed
+        text = text.translate(self._hamza_table)
         logger.debug("Normalized Hamza")
         return text
     
@@ -181,7 +468,7 @@ class ArabicNormalizer:
         Returns:
             Text with normalized Yeh
         """
-        text = text.replace('ى', 'ي')  # Alef Maksura → Ya
+        text = text.translate(self._yeh_table)  # Alef Maksura → Ya
         logger.debug("Normalized Yeh")
         return text
     
@@ -198,15 +485,8 @@ class ArabicNormalizer:
         Returns:
             Text with only Arabic content
         """
-        # Define Arabic character ranges and allowed punctuation
-        # Arabic letters: \u0600-\u06FF (Arabic block)
-        # Arabic Supplement: \u0750-\u077F
-        # Arabic Extended-A: \u08A0-\u08FF
-        # Arabic Presentation Forms: \uFB50-\uFDFF, \uFE70-\uFEFF
-        # Also keep: spaces, newlines, Arabic punctuation, digits
-        
-        pattern = r'[^\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF0-9\s\n\r،؛؟.!،]'
-        text = re.sub(pattern, '', text)
+        # Allowed character ranges are documented on _NON_ARABIC_RE above
+        text = _NON_ARABIC_RE.sub('', text)
         
         logger.debug("Removed non-Arabic characters")
         return text
@@ -224,14 +504,14 @@ class ArabicNormalizer:
             Text with normalized spacing
         """
         # Replace multiple spaces with single space
-        text = re.sub(r' +', ' ', text)
+        text = _MULTI_SPACE_RE.sub(' ', text)
         
         # Replace multiple newlines with double newline (paragraph break)
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+        text = _MULTI_NEWLINE_RE.sub('\n\n', text)
         
-        # Strip spaces from each line
-        lines = [line.strip() for line in text.split('\n')]
-        text = '\n'.join(lines)
+        # Strip spaces around every line break in one C-level pass instead
+        # of a Python loop over split lines
+        text = _LINE_TRIM_RE.sub('\n', text)
         
         # Final trim
         text = text.strip()
@@ -258,7 +538,7 @@ class ArabicNormalizer:
         
         try:
             # Reshape Arabic text (handles character connections)
-            reshaped_text = arabic_reshaper.reshape(text)
+            reshaped_text = self._reshaper.reshape(text)
             
             # Apply bidirectional algorithm
             if self.config.get("apply_bidi", True):
@@ -284,7 +564,7 @@ class ArabicNormalizer:
             Text with normalized punctuation
         """
         # Remove multiple consecutive punctuation marks
-        text = re.sub(r'([،؛؟.!])\1+', r'\1', text)
+        text = _DUP_PUNCT_RE.sub(r'\1', text)
         logger.debug("Removed extra punctuation")
         return text
     
@@ -301,13 +581,11 @@ class ArabicNormalizer:
         """
         if to_eastern:
             # Convert Western to Eastern Arabic numerals
-            translation = str.maketrans('0123456789', '٠١٢٣٤٥٦٧٨٩')
-            text = text.translate(translation)
+            text = text.translate(_TO_EASTERN_DIGITS)
             logger.debug("Converted to Eastern Arabic numerals")
         else:
             # Convert Eastern to Western Arabic numerals
-            translation = str.maketrans('٠١٢٣٤٥٦٧٨٩', '0123456789')
-            text = text.translate(translation)
+            text = text.translate(_TO_WESTERN_DIGITS)
             logger.debug("Converted to Western Arabic numerals")
         
         return text
@@ -327,9 +605,9 @@ class ArabicNormalizer:
             'chars_without_spaces': len(text.replace(' ', '').replace('\n', '')),
             'words': len(text.split()),
             'lines': len(text.splitlines()),
-            'arabic_chars': len(re.findall(r'[\u0600-\u06FF]', text)),
-            'digits': len(re.findall(r'\d', text)),
-            'punctuation': len(re.findall(r'[،؛؟.!]', text)),
+            'arabic_chars': len(_ARABIC_CHAR_RE.findall(text)),
+            'digits': len(_DIGIT_RE.findall(text)),
+            'punctuation': len(_PUNCT_RE.findall(text)),
         }
         
         logger.info(f"Text statistics: {stats}")
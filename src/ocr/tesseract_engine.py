@@ -6,12 +6,21 @@ Arabic text from preprocessed images.
 """
 
 import logging
+import os
+import subprocess
+import tempfile
 import pytesseract
 import numpy as np
 from pathlib import Path
 from typing import Optional, Dict, Any
 from PIL import Image
 
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 from src.config import TESSERACT_PATH, LANG, OEM, PSM
 
 logger = logging.getLogger(__name__)
@@ -51,7 +60,24 @@ class TesseractEngine:
         
         # Verify Tesseract installation
         self._verify_installation()
-    
+
+        # Persistent in-process Tesseract API (optional): pytesseract pays
+        # fork+exec, language model load and temp-file I/O on every call,
+        # while one PyTessBaseAPI held open loads the models once per process
+        self._api = None
+        if TESSEROCR_AVAILABLE:
+            try:
+                self._api = tesserocr.PyTessBaseAPI(
+                    lang=self.lang,
+                    oem=tesserocr.OEM(self.oem),
+                    psm=tesserocr.PSM(self.psm)
+                )
+                logger.info("Using persistent tesserocr API")
+            except Exception as e:
+                logger.warning(f"tesserocr initialization failed ({e}), "
+                               "falling back to pytesseract")
+                self._api = None
+
     def _verify_installation(self) -> bool:
         """
         Verify that Tesseract is properly installed and accessible.
@@ -110,17 +136,22 @@ class TesseractEngine:
                 config = custom_config
             
             logger.debug(f"Running OCR with config: {config}")
-            
+
             # Convert numpy array to PIL Image if needed
             if isinstance(image, np.ndarray):
                 image = Image.fromarray(image)
-            
-            # Perform OCR
-            text = pytesseract.image_to_string(
-                image,
-                lang=self.lang,
-                config=config
-            )
+
+            # Perform OCR: reuse the persistent API when available (custom
+            # configs go through pytesseract, which parses config strings)
+            if self._api is not None and custom_config is None:
+                self._api.SetImage(image)
+                text = self._api.GetUTF8Text()
+            else:
+                text = pytesseract.image_to_string(
+                    image,
+                    lang=self.lang,
+                    config=config
+                )
             
             # Log result
             char_count = len(text)
@@ -242,6 +273,55 @@ class TesseractEngine:
         logger.info(f"Batch OCR completed: {len(texts)}/{total} images processed")
         return texts
     
+    def extract_text_from_file_list(self, image_paths: list) -> list:
+        """
+        OCR many image files with a single Tesseract invocation.
+
+        Tesseract accepts a "list file" (one image path per line) and
+        processes every image in one process, paying the binary startup and
+        language-model load once instead of per page. Pages are separated by
+        form feeds in the combined output. The trade-off versus per-page
+        calls is coarser error recovery: if the invocation fails, no page
+        text is recovered.
+
+        Args:
+            image_paths: Paths (str or Path) of images to OCR, in page order
+
+        Returns:
+            List of extracted text strings, one per input image
+
+        Raises:
+            subprocess.CalledProcessError: If the Tesseract invocation fails
+        """
+        if not image_paths:
+            return []
+
+        list_fd, list_path = tempfile.mkstemp(suffix=".txt", text=True)
+        try:
+            with os.fdopen(list_fd, 'w') as list_file:
+                list_file.write('\n'.join(os.fspath(p) for p in image_paths))
+
+            logger.info(f"Batch OCR of {len(image_paths)} images "
+                        "in one Tesseract invocation")
+            result = subprocess.run(
+                [self.tesseract_path, list_path, 'stdout',
+                 '-l', self.lang,
+                 '--oem', str(self.oem), '--psm', str(self.psm)],
+                capture_output=True, check=True
+            )
+        finally:
+            os.unlink(list_path)
+
+        pages = result.stdout.decode('utf-8', errors='replace').split('\f')
+        if pages and not pages[-1].strip():
+            pages.pop()  # trailing form feed
+
+        # Keep page accounting aligned with the input even if Tesseract
+        # produced fewer separators than expected
+        while len(pages) < len(image_paths):
+            pages.append("")
+        return pages[:len(image_paths)]
+
     def set_language(self, lang: str) -> None:
         """
         Change the OCR language.
@@ -250,6 +330,8 @@ class TesseractEngine:
             lang: Language code (e.g., 'ara', 'eng', 'fra')
         """
         self.lang = lang
+        if self._api is not None:
+            self._api.Init(lang=lang)
         logger.info(f"Language changed to: {lang}")
     
     def set_page_segmentation_mode(self, psm: int) -> None:
@@ -261,6 +343,8 @@ class TesseractEngine:
         """
         if 0 <= psm <= 13:
             self.psm = psm
+            if self._api is not None:
+                self._api.SetPageSegMode(tesserocr.PSM(psm))
             logger.info(f"PSM changed to: {psm}")
         else:
             logger.warning(f"Invalid PSM value: {psm}. Must be 0-13.")
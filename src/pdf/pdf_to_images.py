@@ -6,6 +6,7 @@ Uses pdf2image library with configurable DPI settings.
 """
 
 import logging
+import os
 from pathlib import Path
 from typing import List, Optional
 from pdf2image import convert_from_path
@@ -76,7 +77,8 @@ class PDFToImagesConverter:
                 pdf_path,
                 dpi=self.dpi,
                 fmt=self.image_format.lower(),
-                thread_count=4,  # Use multiple threads for faster conversion
+                thread_count=self._thread_count(),  # Parallel poppler rendering
+                use_pdftocairo=True,  # Typically faster raster than pdftoppm
                 grayscale=False,  # Keep color; preprocessing will handle grayscale
             )
             
@@ -113,7 +115,49 @@ class PDFToImagesConverter:
             logger.error(f"Error converting PDF to images: {e}")
             raise
     
-    def convert_single_page(self, pdf_path: Path, page_number: int, 
+    @staticmethod
+    def _thread_count() -> int:
+        """Poppler rendering threads: one per core, capped at 8."""
+        return min(8, os.cpu_count() or 1)
+
+    def iter_pages(self, pdf_path: Path, batch_size: int = 10):
+        """
+        Yield PDF pages as in-memory PIL images without touching disk.
+
+        Pages are rendered in small first_page/last_page windows, so at most
+        one window of decoded pages is resident at a time and no page image
+        is ever written out and read back.
+
+        Args:
+            pdf_path: Path to the PDF file
+            batch_size: Pages rendered per poppler invocation
+
+        Yields:
+            PIL images, one per page, in page order
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+        """
+        if not validate_pdf_path(pdf_path):
+            raise FileNotFoundError(f"Invalid PDF file: {pdf_path}")
+
+        total = self.get_page_count(pdf_path)
+        logger.info(f"Streaming {total} pages from PDF: {pdf_path}")
+
+        for first in range(1, total + 1, batch_size):
+            last = min(first + batch_size - 1, total)
+            images = convert_from_path(
+                pdf_path,
+                dpi=self.dpi,
+                first_page=first,
+                last_page=last,
+                thread_count=self._thread_count(),
+                use_pdftocairo=True,
+            )
+            for image in images:
+                yield image
+
+    def convert_single_page(self, pdf_path: Path, page_number: int,
                            output_path: Path) -> Path:
         """
         Convert a single page from a PDF to an image.
@@ -34,18 +34,44 @@ class ImagePreprocessor:
                    (default: use PREPROCESS_CONFIG from config.py)
         """
         self.config = config if config is not None else PREPROCESS_CONFIG
+
+        # CLAHE object and scratch buffers are reused across pages: all
+        # pages of a PDF usually share one size, so the full-size
+        # intermediates (blur, CLAHE, threshold) are allocated once instead
+        # of malloc/freed per page
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        self._buffer_shape = None
+        self._blur = None
+        self._enhanced = None
+        self._binary = None
+
         logger.info("ImagePreprocessor initialized")
         logger.debug(f"Configuration: {self.config}")
-    
+
+    def _ensure_buffers(self, shape: Tuple[int, ...]) -> None:
+        """
+        (Re)allocate the grayscale scratch buffers for a new page shape.
+
+        Args:
+            shape: Shape of the incoming grayscale page
+        """
+        if self._buffer_shape != shape:
+            self._blur = np.empty(shape, dtype=np.uint8)
+            self._enhanced = np.empty(shape, dtype=np.uint8)
+            self._binary = np.empty(shape, dtype=np.uint8)
+            self._buffer_shape = shape
+
     def preprocess(self, image: np.ndarray) -> np.ndarray:
         """
         Apply full preprocessing pipeline to an image.
-        
+
         Args:
             image: Input image as numpy array (can be BGR or grayscale)
-            
+
         Returns:
-            Preprocessed image as numpy array
+            Preprocessed image as numpy array. May alias an internal scratch
+            buffer that is overwritten by the next preprocess() call, so
+            copy it if it must outlive the next page.
         """
         logger.debug("Starting preprocessing pipeline")
         
@@ -103,7 +129,11 @@ class ImagePreprocessor:
             Denoised image
         """
         kernel_size = self.config.get("gaussian_kernel_size", (5, 5))
-        denoised = cv2.GaussianBlur(image, kernel_size, 0)
+        if image.ndim == 2 and image.dtype == np.uint8:
+            self._ensure_buffers(image.shape)
+            denoised = cv2.GaussianBlur(image, kernel_size, 0, dst=self._blur)
+        else:
+            denoised = cv2.GaussianBlur(image, kernel_size, 0)
         logger.debug(f"Applied noise removal with kernel size {kernel_size}")
         return denoised
     
@@ -119,8 +149,11 @@ class ImagePreprocessor:
         Returns:
             Contrast-enhanced image
         """
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(image)
+        if image.ndim == 2 and image.dtype == np.uint8:
+            self._ensure_buffers(image.shape)
+            enhanced = self._clahe.apply(image, self._enhanced)
+        else:
+            enhanced = self._clahe.apply(image)
         logger.debug("Applied contrast enhancement (CLAHE)")
         return enhanced
     
@@ -137,9 +170,16 @@ class ImagePreprocessor:
             Binary image (black text on white background)
         """
         # Apply Otsu's thresholding
-        _, binary = cv2.threshold(
-            image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
-        )
+        if image.ndim == 2 and image.dtype == np.uint8:
+            self._ensure_buffers(image.shape)
+            _, binary = cv2.threshold(
+                image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU,
+                dst=self._binary
+            )
+        else:
+            _, binary = cv2.threshold(
+                image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
+            )
         logger.debug("Applied Otsu's binarization")
         return binary
     
@@ -244,24 +284,28 @@ class ImagePreprocessor:
         """
         if not Path(image_path).exists():
             raise FileNotFoundError(f"Image file not found: {image_path}")
-        
+
+        # Stringify once; cv2 wants strings and the output path below is
+        # derived from the same value
+        image_str = str(image_path)
+
         # Load image
-        image = cv2.imread(str(image_path))
-        
+        image = cv2.imread(image_str)
+
         if image is None:
             raise ValueError(f"Failed to load image: {image_path}")
-        
+
         logger.info(f"Loaded image: {image_path} (shape: {image.shape})")
-        
+
         # Preprocess
         preprocessed = self.preprocess(image)
-        
+
         # Save if requested
         if save_output:
             if output_path is None:
                 # Generate output path
-                output_path = Path(str(image_path).replace('.png', '_preprocessed.png'))
-            
+                output_path = image_str[:image_str.rfind('.')] + '_preprocessed.png'
+
             cv2.imwrite(str(output_path), preprocessed)
             logger.info(f"Saved preprocessed image to: {output_path}")
         
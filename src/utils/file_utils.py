@@ -53,35 +53,44 @@ def get_pdf_files(directory: Path) -> List[Path]:
     return pdf_files
 
 
-def list_images_sorted(directory: Path, extension: str = "png") -> List[Path]:
+def list_images_sorted(directory: Path, extension: str = "png") -> List[str]:
     """
     List image files in a directory, sorted numerically by page number.
-    
+
     This function handles filenames like 'page_001.png', 'page_002.png', etc.
     and sorts them in numerical order rather than alphabetical order.
-    
+
+    Uses os.scandir and returns plain path strings: downstream consumers
+    (cv2.imread, Tesseract) want strings anyway, and skipping the per-file
+    Path construction is measurable over thousands of pages.
+
     Args:
         directory: Path to directory containing images
         extension: Image file extension (default: "png")
-        
+
     Returns:
-        List of Path objects for image files, sorted numerically
+        List of path strings for image files, sorted numerically
     """
     directory = Path(directory)
     if not directory.exists():
         logger.warning(f"Directory does not exist: {directory}")
         return []
-    
-    # Get all images with the specified extension
-    images = list(directory.glob(f"*.{extension}"))
-    
-    # Sort numerically by extracting page numbers
-    def extract_page_number(filepath: Path) -> int:
-        """Extract page number from filename like 'page_001.png'"""
-        match = re.search(r'page_(\d+)', filepath.stem)
-        return int(match.group(1)) if match else 0
-    
-    images_sorted = sorted(images, key=extract_page_number)
+
+    suffix = f".{extension}"
+    page_re = re.compile(r'page_(\d+)')
+
+    # Collect (page_number, path) pairs straight from the directory entries
+    images = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith(suffix) or not entry.is_file():
+                continue
+            match = page_re.search(entry.name)
+            page_number = int(match.group(1)) if match else 0
+            images.append((page_number, entry.path))
+
+    images.sort()
+    images_sorted = [path for _, path in images]
     logger.debug(f"Found {len(images_sorted)} images in {directory}")
     return images_sorted
 